@@ -0,0 +1,55 @@
+import ast
+import random
+import time
+
+import pandas as pd
+
+from email_log_reader import decode_recipients
+
+# Compare decode_recipients() against the per-row ast.literal_eval normalization it replaced.
+# Usage: python benchmark_recipients.py
+
+
+def literal_eval_recipients(recipients):
+    # The normalization refactored_script.py used before decode_recipients()
+    def normalize_recipients(recipients_str):
+        try:
+            recipients_str = recipients_str.strip("'\"")
+            recipients_list = ast.literal_eval(recipients_str)
+            return [recipient.lower() for recipient in recipients_list]
+        except (ValueError, SyntaxError):
+            return []
+
+    exploded = recipients.apply(normalize_recipients).explode().dropna()
+    return exploded.to_frame('Recipient').assign(Recipient_Domain=exploded.str.extract(r'@(.+)$', expand=False))
+
+
+def make_recipients(rows, list_share, seed=0):
+    rng = random.Random(seed)
+    values = []
+    for _ in range(rows):
+        addresses = [f"User{rng.randrange(5000)}@Domain{rng.randrange(200)}.com" for _ in range(rng.randint(1, 4))]
+        if rng.random() < list_share:
+            values.append(repr(addresses))
+        else:
+            values.append(', '.join(addresses))
+    return pd.Series(values)
+
+
+def best_of(function, recipients, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(recipients)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+if __name__ == "__main__":
+    rows = 200_000
+    for label, list_share in (("list literals", 1.0), ("50/50 list and delimited", 0.5)):
+        recipients = make_recipients(rows, list_share)
+        baseline = best_of(literal_eval_recipients, recipients)
+        decoded = best_of(lambda series: decode_recipients(series), recipients)
+        print(f"{label}, {rows} rows: literal_eval {baseline:.2f}s, decode_recipients {decoded:.2f}s "
+              f"({baseline / decoded:.1f}x)")
@@ -0,0 +1,214 @@
+import glob
+import logging
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+# Daily gateway exports are written as gzip or zstd compressed CSV files.
+# pandas infers the codec from the extension (zstd needs the `zstandard` package).
+LOG_FILE_PATTERNS = ("*.csv", "*.csv.gz", "*.csv.zst", "*.csv.zstd")
+
+# Every partial aggregate carries the same set of counters so they can be merged key by key
+COUNT_KEYS = (
+    "sender",
+    "recipient",
+    "sender_domain",
+    "recipient_domain",
+    "sender_recipient",
+    "sender_recipient_domain",
+    "sender_domain_recipient",
+    "sender_domain_recipient_domain",
+)
+
+
+def find_email_log_files(logs_path):
+    # Accept a directory of daily files, a glob pattern or a single file
+    if os.path.isdir(logs_path):
+        files = []
+        for pattern in LOG_FILE_PATTERNS:
+            files.extend(glob.glob(os.path.join(logs_path, pattern)))
+    else:
+        files = glob.glob(logs_path)
+    return sorted(set(files))
+
+
+# Sender and recipient domains are both taken from the first '@' onwards
+DOMAIN_PATTERN = r'@(.+)$'
+
+# A Python list or tuple literal of quoted addresses, e.g. "['a@x.com', \"b@y.com\"]", allowing backslash escapes
+_QUOTED_ITEM = r"""(?:'[^'\\]*(?:\\.[^'\\]*)*'|"[^"\\]*(?:\\.[^"\\]*)*")"""
+_QUOTED_ITEMS = rf"\s*(?:{_QUOTED_ITEM}\s*(?:,\s*{_QUOTED_ITEM}\s*)*,?)?\s*"
+RECIPIENT_LIST_PATTERN = rf"\[{_QUOTED_ITEMS}\]|\({_QUOTED_ITEMS}\)"
+
+# Quote-aware tokenizers for the rare rows carrying display names ("Doe, John" <j@x.com>)
+QUOTED_LIST_ITEM_PATTERN = r"""'([^'\\]*(?:\\.[^'\\]*)*)'|"([^"\\]*(?:\\.[^"\\]*)*)\""""
+DELIMITED_ITEM_PATTERN = r'((?:"[^"]*"|[^,;"])+)'
+
+
+def decode_recipients(recipients):
+    # Normalize the Recipients column into one row per recipient, indexed by the source row.
+    # Rows may be list/tuple literals ("['a@x.com', 'b@y.com']") or delimited strings ("a@x.com; b@y.com").
+    # Most rows take a plain split/explode; only rows with display names (<...>) go through regex tokenizing.
+    # Returns the exploded recipients plus the number of malformed rows, which are skipped.
+    text = recipients.fillna('').astype(str).str.strip().str.lower()
+
+    # Drop one pair of matching outer quotes, as the old strip("'\"") did
+    first, last = text.str[:1], text.str[-1:]
+    wrapped = (first == last) & first.isin(["'", '"']) & (text.str.len() > 1)
+    if wrapped.any():
+        text[wrapped] = text[wrapped].str[1:-1].str.strip()
+        first[wrapped], last[wrapped] = text[wrapped].str[:1], text[wrapped].str[-1:]
+
+    # List rows must parse as a literal of quoted strings. Delimited rows may not hold brackets,
+    # unbalanced double quotes or a single quote on only one end.
+    is_list = first.isin(['[', '(']) | last.isin([']', ')'])
+    malformed = pd.Series(False, index=text.index)
+    malformed[is_list] = ~text[is_list].str.fullmatch(RECIPIENT_LIST_PATTERN)
+    delimited = text[~is_list]
+    malformed[~is_list] = (
+        delimited.str.contains(r'[\[\]()]', regex=True)
+        | (delimited.str.count('"') % 2 == 1)
+        | ((first[~is_list] == "'") != (last[~is_list] == "'"))
+    )
+    text[is_list] = text[is_list].str[1:-1]
+    text = text[~malformed]
+    is_list = is_list[~malformed]
+
+    # Commas inside quoted display names need the quote-aware tokenizers
+    has_display_name = text.str.contains('<', regex=False)
+    tokens = text[~has_display_name].str.split(r'[,;]', regex=True).explode()
+    if has_display_name.any():
+        display_list = text[has_display_name & is_list].str.extractall(QUOTED_LIST_ITEM_PATTERN)
+        display_tokens = pd.concat([
+            display_list[0].fillna(display_list[1]),
+            text[has_display_name & ~is_list].str.extractall(DELIMITED_ITEM_PATTERN)[0],
+        ]).droplevel('match')
+        display_tokens = display_tokens.str.extract(r'<([^<>]*)>', expand=False).fillna(display_tokens)
+        tokens = pd.concat([tokens, display_tokens]).sort_index(kind='stable')
+
+    # Quotes only wrap items, so strip them from the ends and keep apostrophes inside addresses
+    addresses = tokens.str.strip(' \'"')
+    addresses = addresses[addresses.notna() & (addresses != '')]
+    escaped = addresses.str.contains('\\', regex=False)
+    if escaped.any():
+        addresses[escaped] = (
+            addresses[escaped].str.replace("\\'", "'", regex=False).str.replace('\\"', '"', regex=False)
+            .str.replace('\\\\', '\\', regex=False)
+        )
+
+    exploded = pd.DataFrame({
+        'Recipient': addresses.astype(text.dtype),
+        'Recipient_Domain': addresses.str.extract(DOMAIN_PATTERN, expand=False),
+    })
+    return exploded, int(malformed.sum())
+
+
+def count_email_log(email_logs):
+    email_logs['Sender'] = email_logs['Sender'].str.lower()
+    email_logs['Sender_Domain'] = email_logs['Sender'].str.extract(DOMAIN_PATTERN, expand=False)
+
+    # One row per recipient, joined back to its sender
+    recipients, malformed = decode_recipients(email_logs['Recipients'])
+    email_logs_exploded = recipients.join(email_logs[['Sender', 'Sender_Domain']])
+
+    # Single and pair counts, kept as Counters so partial results can be added together
+    counts = {
+        "sender": Counter(email_logs['Sender'].value_counts().to_dict()),
+        "recipient": Counter(email_logs_exploded['Recipient'].value_counts().to_dict()),
+        "sender_domain": Counter(email_logs['Sender_Domain'].value_counts().to_dict()),
+        "recipient_domain": Counter(email_logs_exploded['Recipient_Domain'].value_counts().to_dict()),
+        "sender_recipient": Counter(email_logs_exploded.groupby(['Sender', 'Recipient']).size().to_dict()),
+        "sender_recipient_domain": Counter(email_logs_exploded.groupby(['Sender', 'Recipient_Domain']).size().to_dict()),
+        "sender_domain_recipient": Counter(email_logs_exploded.groupby(['Sender_Domain', 'Recipient']).size().to_dict()),
+        "sender_domain_recipient_domain": Counter(email_logs_exploded.groupby(['Sender_Domain', 'Recipient_Domain']).size().to_dict()),
+    }
+    return counts, malformed
+
+
+def empty_counts():
+    return {key: Counter() for key in COUNT_KEYS}
+
+
+def merge_counts(left, right):
+    # Counter.update adds counts instead of replacing them
+    for key in COUNT_KEYS:
+        left[key].update(right[key])
+    return left
+
+
+def process_email_log_file(path):
+    # Runs in a worker process: decompress, parse and count a single daily file
+    start = time.perf_counter()
+    email_logs = pd.read_csv(path, compression='infer', usecols=['Sender', 'Recipients'])
+    counts, malformed = count_email_log(email_logs)
+    elapsed = time.perf_counter() - start
+
+    compressed_bytes = os.path.getsize(path)
+    stats = {
+        "file": path,
+        "rows": len(email_logs),
+        "malformed_recipients": malformed,
+        "compressed_bytes": compressed_bytes,
+        "seconds": elapsed,
+        "mb_per_second": compressed_bytes / (1024 * 1024) / elapsed if elapsed else 0.0,
+        "rows_per_second": len(email_logs) / elapsed if elapsed else 0.0,
+    }
+    return counts, stats
+
+
+def summarize_throughput(throughput, wall_seconds):
+    # Aggregate rate uses wall time, since the files are read in parallel
+    compressed_bytes = sum(stats['compressed_bytes'] for stats in throughput)
+    return {
+        "files": len(throughput),
+        "rows": sum(stats['rows'] for stats in throughput),
+        "malformed_recipients": sum(stats['malformed_recipients'] for stats in throughput),
+        "compressed_bytes": compressed_bytes,
+        "seconds": wall_seconds,
+        "mb_per_second": compressed_bytes / (1024 * 1024) / wall_seconds if wall_seconds else 0.0,
+    }
+
+
+def read_email_logs(logs_path, max_workers=None):
+    files = find_email_log_files(logs_path)
+    if not files:
+        raise FileNotFoundError(f"No email log files found for {logs_path}")
+
+    start = time.perf_counter()
+    counts = empty_counts()
+    throughput = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(process_email_log_file, path): path for path in files}
+        # Fold each file into the running totals as it finishes instead of holding every partial until the end
+        for future in as_completed(futures):
+            path = futures.pop(future)
+            try:
+                file_counts, stats = future.result()
+            except Exception as e:
+                # One bad daily file stops the read; say which one and skip the files not yet started
+                for pending in futures:
+                    pending.cancel()
+                raise RuntimeError(f"Error reading email log file {path}: {e}") from e
+            merge_counts(counts, file_counts)
+            throughput.append(stats)
+            logging.info(
+                f"Read {os.path.basename(stats['file'])}: {stats['rows']} rows in {stats['seconds']:.2f}s "
+                f"({stats['mb_per_second']:.2f} MB/s compressed, {stats['rows_per_second']:.0f} rows/s)"
+            )
+            if stats['malformed_recipients']:
+                logging.warning(
+                    f"{os.path.basename(stats['file'])}: {stats['malformed_recipients']} rows with malformed recipients skipped"
+                )
+
+    # Report files in name order regardless of completion order
+    throughput.sort(key=lambda stats: stats['file'])
+    summary = summarize_throughput(throughput, time.perf_counter() - start)
+    logging.info(
+        f"Read {summary['files']} email log files: {summary['rows']} rows, "
+        f"{summary['compressed_bytes'] / (1024 * 1024):.1f} MB compressed in {summary['seconds']:.2f}s "
+        f"({summary['mb_per_second']:.2f} MB/s), {summary['malformed_recipients']} rows with malformed recipients"
+    )
+    return counts, throughput
@@ -2,34 +2,34 @@ import os
 import re
 import pandas as pd
 import logging
+from email_log_reader import read_email_logs
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 
 def extract_dlp_policies(directory_path, output_directory, email_logs_path):
-    # Read email logs
-    email_logs = pd.read_csv(email_logs_path)  # Assume email logs are in CSV format
-    # Convert recipients to lists and trim whitespace
-    email_logs['Recipients'] = email_logs['Recipients'].apply(lambda x: [recipient.strip() for recipient in x.split(',')])
+    # Read the email logs (a single CSV, or a directory/glob of compressed daily files) in parallel
+    # Per-file and total throughput are logged by the reader
+    counts, _ = read_email_logs(email_logs_path)
 
-    # Explode recipients to separate rows
-    email_logs_exploded = email_logs.explode('Recipients')
-
-    # Extract domains
-    email_logs['Sender_Domain'] = email_logs['Sender'].str.extract(r'@(.+)$')
-    email_logs_exploded['Recipient_Domain'] = email_logs_exploded['Recipients'].str.extract(r'@(.+)$')
-
-    # Compute counts upfront
-    sender_counts = email_logs['Sender'].value_counts().to_dict()
-    recipient_counts = email_logs_exploded['Recipients'].value_counts().to_dict()
-    sender_domain_counts = email_logs['Sender_Domain'].value_counts().to_dict()
-    recipient_domain_counts = email_logs_exploded['Recipient_Domain'].value_counts().to_dict()
+    # Counts computed upfront by the reader
+    sender_counts = counts["sender"]
+    recipient_counts = counts["recipient"]
+    sender_domain_counts = counts["sender_domain"]
+    recipient_domain_counts = counts["recipient_domain"]
 
     # Group counts for sender-recipient combinations
-    sender_recipient_counts = email_logs_exploded.groupby(['Sender', 'Recipients']).size().to_dict()
-    sender_recipient_domain_counts = email_logs_exploded.groupby(['Sender', 'Recipient_Domain']).size().to_dict()
-    sender_domain_recipient_counts = email_logs_exploded.groupby(['Sender_Domain', 'Recipients']).size().to_dict()
-    sender_domain_recipient_domain_counts = email_logs_exploded.groupby(['Sender_Domain', 'Recipient_Domain']).size().to_dict()
+    sender_recipient_counts = counts["sender_recipient"]
+    sender_recipient_domain_counts = counts["sender_recipient_domain"]
+    sender_domain_recipient_counts = counts["sender_domain_recipient"]
+    sender_domain_recipient_domain_counts = counts["sender_domain_recipient_domain"]
+
+    # Map each sender domain to its senders for the Local policy lookups
+    senders_by_domain = {}
+    for sender in sender_counts:
+        match = re.search(r'@(.+)$', sender)
+        if match:
+            senders_by_domain.setdefault(match.group(1), []).append(sender)
 
     # Iterate over each file in the directory
     for filename in os.listdir(directory_path):
@@ -63,11 +63,11 @@ def extract_dlp_policies(directory_path, output_directory, email_logs_path):
                         sender_domains = re.findall(r'Sender domain is:\s*(.*)', conditions_text)
                         whitelisted_recipients = re.findall(r'Recipient address contains words:\s*(.*)', conditions_text)
 
-                        # Split the found items by comma and clean whitespace
-                        emails = [email.strip() for email in ','.join(emails).split(',') if email.strip()]
-                        recipient_domains = [domain.strip() for domain in ','.join(recipient_domains).split(',') if domain.strip()]
-                        sender_domains = [domain.strip() for domain in ','.join(sender_domains).split(',') if domain.strip()]
-                        whitelisted_recipients = [recipient.strip() for recipient in ','.join(whitelisted_recipients).split(',') if recipient.strip()]
+                        # Split the found items by comma and clean whitespace, then convert to lowercase to match the logs
+                        emails = [email.strip().lower() for email in ','.join(emails).split(',') if email.strip()]
+                        recipient_domains = [domain.strip().lower() for domain in ','.join(recipient_domains).split(',') if domain.strip()]
+                        sender_domains = [domain.strip().lower() for domain in ','.join(sender_domains).split(',') if domain.strip()]
+                        whitelisted_recipients = [recipient.strip().lower() for recipient in ','.join(whitelisted_recipients).split(',') if recipient.strip()]
 
                         # Create a unified DataFrame to hold the results
                         unified_data = {
@@ -149,7 +149,7 @@ def extract_dlp_policies(directory_path, output_directory, email_logs_path):
                                     # Sender is a domain
                                     total_email_count = 0
                                     # Get all senders in the domain
-                                    senders_in_domain = email_logs[email_logs['Sender_Domain'] == sender]['Sender'].unique()
+                                    senders_in_domain = senders_by_domain.get(sender, [])
                                     for s in senders_in_domain:
                                         # Emails to recipient emails
                                         for recipient in recipient_emails:
@@ -224,8 +224,9 @@ def extract_dlp_policies(directory_path, output_directory, email_logs_path):
             except Exception as e:
                 logging.error(f"Error processing file {filename}: {e}")
 
-# Example usage
-directory_path = "path/to/txt/files"  # Replace with the actual directory path containing the text files
-output_directory = "path/to/output"  # Replace with the actual directory path for Excel files
-email_logs_path = "path/to/email_logs.csv"  # Path to the email logs CSV file
-extract_dlp_policies(directory_path, output_directory, email_logs_path)
+# Example usage (guarded so the reader's worker processes don't re-run it on import)
+if __name__ == "__main__":
+    directory_path = "path/to/txt/files"  # Replace with the actual directory path containing the text files
+    output_directory = "path/to/output"  # Replace with the actual directory path for Excel files
+    email_logs_path = "path/to/email_logs"  # Email logs CSV file, or a directory/glob of daily .csv.gz/.csv.zst files
+    extract_dlp_policies(directory_path, output_directory, email_logs_path)
@@ -2,7 +2,7 @@ import os
 import re
 import pandas as pd
 import logging
-import ast
+from email_log_reader import decode_recipients
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
@@ -11,21 +11,14 @@ def extract_dlp_policies(directory_path, output_directory, email_logs_path):
     # Read email logs
     email_logs = pd.read_csv(email_logs_path)  # Assume email logs are in CSV format
     
-    # Clean and normalize the recipients data
-    def normalize_recipients(recipients_str):
-        try:
-            # Remove outer quotes if present
-            recipients_str = recipients_str.strip("'\"")
-            # Safely convert the string representation of a list to an actual list
-            recipients_list = ast.literal_eval(recipients_str)
-            # Convert all recipients to lowercase
-            return [recipient.lower() for recipient in recipients_list]
-        except (ValueError, SyntaxError):
-            # If it can't be converted, return an empty list or handle appropriately
-            return []
-
-    # Apply normalization to the Recipients column and convert Sender to lowercase
-    email_logs['Recipients'] = email_logs['Recipients'].apply(normalize_recipients)
+    # Decode the recipients (list literals or delimited strings) into one lowercased row per recipient
+    recipient_rows, malformed_recipients = decode_recipients(email_logs['Recipients'])
+    if malformed_recipients:
+        logging.warning(f"{malformed_recipients} rows with malformed recipients skipped")
+    # Like the old split('@')[-1], a recipient without '@' is matched against domains as-is
+    recipient_rows['Recipient_Domain'] = recipient_rows['Recipient_Domain'].fillna(recipient_rows['Recipient'])
+    # Keep the normalized recipients on the logs for the Related Logs sheet (malformed rows become empty)
+    email_logs['Recipients'] = recipient_rows.groupby(level=0)['Recipient'].agg(', '.join).reindex(email_logs.index).fillna('')
     email_logs['Sender'] = email_logs['Sender'].str.lower()
 
     # Iterate over each file in the directory
@@ -87,15 +80,13 @@ def extract_dlp_policies(directory_path, output_directory, email_logs_path):
                             return email_logs[email_logs['Sender'].str.contains(sender_pattern, na=False)]
 
                         def filter_logs_by_recipient(recipients, domains):
-                            def recipient_match(recipient_list):
-                                for recipient in recipient_list:
-                                    if recipient in recipients:
-                                        return True
-                                    domain = recipient.split('@')[-1]
-                                    if domain in domains:
-                                        return True
-                                return False
-                            return email_logs[email_logs['Recipients'].apply(recipient_match)]
+                            matches = recipient_rows['Recipient'].isin(recipients) | recipient_rows['Recipient_Domain'].isin(domains)
+                            return email_logs[email_logs.index.isin(recipient_rows.index[matches])]
+
+                        # Count the logs in a subset that include a given recipient email or domain
+                        def count_logs_by_recipient(logs, column, value):
+                            matches = recipient_rows.index.isin(logs.index) & (recipient_rows[column] == value)
+                            return recipient_rows.index[matches].nunique()
 
                         # Process VIP Policy: Count emails sent by whitelisted senders
                         if policy_type == "VIP":
@@ -129,16 +120,14 @@ def extract_dlp_policies(directory_path, output_directory, email_logs_path):
                                 unified_data["Number of Emails Sent"].append(count)
                                 unified_data["Number of Emails Received"].append("")
                             for recipient in whitelisted_recipients:
-                                count = global_logs_recipient[global_logs_recipient['Recipients'].apply(lambda x: recipient in x)].shape[0]
+                                count = count_logs_by_recipient(global_logs_recipient, 'Recipient', recipient)
                                 unified_data["Policy Type"].append("Global")
                                 unified_data["Whitelisted Item Type"].append("Whitelisted Recipient Email")
                                 unified_data["Item"].append(recipient)
                                 unified_data["Number of Emails Sent"].append("")
                                 unified_data["Number of Emails Received"].append(count)
                             for domain in recipient_domains:
-                                count = global_logs_recipient[global_logs_recipient['Recipients'].apply(
-                                    lambda x: any(recipient.split('@')[-1] == domain for recipient in x)
-                                )].shape[0]
+                                count = count_logs_by_recipient(global_logs_recipient, 'Recipient_Domain', domain)
                                 unified_data["Policy Type"].append("Global")
                                 unified_data["Whitelisted Item Type"].append("Whitelisted Recipient Domain")
                                 unified_data["Item"].append(domain)
@@ -148,11 +137,8 @@ def extract_dlp_policies(directory_path, output_directory, email_logs_path):
                         # Process Local Policy: Count emails only between whitelisted senders and recipients
                         elif policy_type in ["Local", "Local2"]:
                             local_logs = filter_logs_by_sender(all_senders)
-                            local_logs = local_logs[local_logs['Recipients'].apply(
-                                lambda recipient_list: any(
-                                    recipient in whitelisted_recipients or recipient.split('@')[-1] in recipient_domains
-                                    for recipient in recipient_list
-                                )
+                            local_logs = local_logs[local_logs.index.isin(
+                                filter_logs_by_recipient(whitelisted_recipients, recipient_domains).index
                             )]
                             related_logs.append(local_logs)
                             for sender in all_senders:
@@ -163,16 +149,14 @@ def extract_dlp_policies(directory_path, output_directory, email_logs_path):
                                 unified_data["Number of Emails Sent"].append(count)
                                 unified_data["Number of Emails Received"].append("")
                             for recipient in whitelisted_recipients:
-                                count = local_logs[local_logs['Recipients'].apply(lambda x: recipient in x)].shape[0]
+                                count = count_logs_by_recipient(local_logs, 'Recipient', recipient)
                                 unified_data["Policy Type"].append("Local")
                                 unified_data["Whitelisted Item Type"].append("Whitelisted Recipient Email")
                                 unified_data["Item"].append(recipient)
                                 unified_data["Number of Emails Sent"].append("")
                                 unified_data["Number of Emails Received"].append(count)
                             for domain in recipient_domains:
-                                count = local_logs[local_logs['Recipients'].apply(
-                                    lambda x: any(recipient.split('@')[-1] == domain for recipient in x)
-                                )].shape[0]
+                                count = count_logs_by_recipient(local_logs, 'Recipient_Domain', domain)
                                 unified_data["Policy Type"].append("Local")
                                 unified_data["Whitelisted Item Type"].append("Whitelisted Recipient Domain")
                                 unified_data["Item"].append(domain)
@@ -229,7 +213,8 @@ def extract_dlp_policies(directory_path, output_directory, email_logs_path):
                 logging.error(f"Error processing file {filename}: {e}")
 
 # Example usage
-directory_path = "path/to/txt/files"  # Replace with the actual directory path containing the text files
-output_directory = "path/to/output"  # Replace with the actual directory path for Excel files
-email_logs_path = "path/to/email_logs.csv"  # Path to the email logs CSV file
-extract_dlp_policies(directory_path, output_directory, email_logs_path)
\ No newline at end of file
+if __name__ == "__main__":
+    directory_path = "path/to/txt/files"  # Replace with the actual directory path containing the text files
+    output_directory = "path/to/output"  # Replace with the actual directory path for Excel files
+    email_logs_path = "path/to/email_logs.csv"  # Path to the email logs CSV file
+    extract_dlp_policies(directory_path, output_directory, email_logs_path)
@@ -0,0 +1,133 @@
+import gzip
+
+import pandas as pd
+import pytest
+
+from email_log_reader import (
+    count_email_log,
+    decode_recipients,
+    find_email_log_files,
+    read_email_logs,
+    summarize_throughput,
+)
+
+DAILY_LOGS = [
+    pd.DataFrame({
+        "Sender": ["a@corp.com", "B@corp.com", "c@other.org"],
+        "Recipients": ["x@ext.com, y@ext.com", "x@ext.com", "a@corp.com; z@ext.net"],
+    }),
+    pd.DataFrame({
+        "Sender": ["a@corp.com", "c@other.org"],
+        "Recipients": ["['x@ext.com', 'a@corp.com']", "y@ext.com"],
+    }),
+    pd.DataFrame({
+        "Sender": ["b@corp.com"],
+        "Recipients": ["z@ext.net, x@ext.com"],
+    }),
+]
+
+
+@pytest.fixture
+def daily_logs_dir(tmp_path):
+    # One plain, one gzip and one zstd compressed daily file
+    DAILY_LOGS[0].to_csv(tmp_path / "2024-01-01.csv", index=False)
+    with gzip.open(tmp_path / "2024-01-02.csv.gz", "wt", newline="") as file:
+        DAILY_LOGS[1].to_csv(file, index=False)
+    DAILY_LOGS[2].to_csv(tmp_path / "2024-01-03.csv.zst", index=False, compression="zstd")
+    (tmp_path / "notes.txt").write_text("not a log")
+    return tmp_path
+
+
+def test_find_email_log_files_directory_and_glob(daily_logs_dir):
+    assert [path.rsplit("/", 1)[-1] for path in find_email_log_files(str(daily_logs_dir))] == [
+        "2024-01-01.csv",
+        "2024-01-02.csv.gz",
+        "2024-01-03.csv.zst",
+    ]
+    assert len(find_email_log_files(str(daily_logs_dir / "*.csv.gz"))) == 1
+
+
+def test_read_email_logs_merge_matches_single_csv(daily_logs_dir, tmp_path_factory):
+    single_csv = tmp_path_factory.mktemp("single") / "email_logs.csv"
+    pd.concat(DAILY_LOGS, ignore_index=True).to_csv(single_csv, index=False)
+    expected, _ = count_email_log(pd.read_csv(single_csv))
+
+    counts, throughput = read_email_logs(str(daily_logs_dir), max_workers=2)
+
+    assert counts == expected
+    assert counts["sender"]["b@corp.com"] == 2
+    assert counts["recipient"]["x@ext.com"] == 4
+    assert counts["sender_domain_recipient_domain"][("corp.com", "ext.com")] == 5
+    assert [stats["rows"] for stats in throughput] == [3, 2, 1]
+
+
+def test_summarize_throughput(daily_logs_dir):
+    _, throughput = read_email_logs(str(daily_logs_dir), max_workers=2)
+    compressed_bytes = sum((daily_logs_dir / name).stat().st_size
+                           for name in ("2024-01-01.csv", "2024-01-02.csv.gz", "2024-01-03.csv.zst"))
+
+    summary = summarize_throughput(throughput, 2.0)
+
+    assert summary["files"] == 3
+    assert summary["rows"] == 6
+    assert summary["malformed_recipients"] == 0
+    assert summary["compressed_bytes"] == compressed_bytes
+    assert summary["mb_per_second"] == pytest.approx(compressed_bytes / (1024 * 1024) / 2.0)
+
+
+def test_read_email_logs_reports_bad_file(daily_logs_dir):
+    (daily_logs_dir / "2024-01-04.csv.gz").write_bytes(b"not gzip data")
+
+    with pytest.raises(RuntimeError, match="2024-01-04.csv.gz"):
+        read_email_logs(str(daily_logs_dir), max_workers=2)
+
+
+def test_read_email_logs_no_files(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        read_email_logs(str(tmp_path))
+
+
+def test_decode_recipients():
+    recipients = pd.Series([
+        "['A@x.com', 'b@y.com']",
+        "a@x.com, B@y.com",
+        "a@x.com; b@y.com",
+        "[]",
+        None,
+        "['a@x.com'",
+        "[a@x.com]",
+        "[\"o'brien@x.com\"]",
+        "o'brien@x.com, c@z.com",
+        "John Doe <J@x.com>",
+        "['Doe, John <j@x.com>']",
+        "\"Doe, John\" <j@x.com>; k@y.com",
+        "'a@x.com, b@y.com'",
+        "\"a@x.com, b@y.com\"",
+        "('a@x.com', 'b@y.com')",
+        "['o\\'brien@x.com']",
+        "('a@x.com'",
+    ])
+
+    exploded, malformed = decode_recipients(recipients)
+
+    assert malformed == 3
+    assert list(exploded.index) == [0, 0, 1, 1, 2, 2, 7, 8, 8, 9, 10, 11, 11, 12, 12, 13, 13, 14, 14, 15]
+    assert list(exploded["Recipient"]) == [
+        "a@x.com", "b@y.com",
+        "a@x.com", "b@y.com",
+        "a@x.com", "b@y.com",
+        "o'brien@x.com",
+        "o'brien@x.com", "c@z.com",
+        "j@x.com",
+        "j@x.com",
+        "j@x.com", "k@y.com",
+        "a@x.com", "b@y.com",
+        "a@x.com", "b@y.com",
+        "a@x.com", "b@y.com",
+        "o'brien@x.com",
+    ]
+    assert list(exploded["Recipient_Domain"]) == [
+        "x.com", "y.com", "x.com", "y.com", "x.com", "y.com",
+        "x.com", "x.com", "z.com", "x.com", "x.com", "x.com", "y.com",
+        "x.com", "y.com", "x.com", "y.com", "x.com", "y.com", "x.com",
+    ]
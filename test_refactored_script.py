@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+from refactored_script import extract_dlp_policies
+
+pytest.importorskip("xlsxwriter")
+pytest.importorskip("openpyxl")
+
+POLICIES = """\
+Name: CORP-EPPA-DLP-Global
+Conditions
+    Sender is: a@corp.com
+    Recipient domain is: ext.com
+    Recipient address contains words: y@ext.com
+Actions
+Name: CORP-EPPA-DLP-Local
+Conditions
+    Sender is: a@corp.com, b@corp.com
+    Recipient domain is: ext.com
+    Recipient address contains words: z@other.com
+Actions
+"""
+
+EMAIL_LOGS = pd.DataFrame({
+    "Sender": ["a@corp.com", "A@corp.com", "b@corp.com", "c@else.com"],
+    "Recipients": ["['x@ext.com', 'y@ext.com']", "['Z@other.com']", "['ext.com']", "['y@ext.com']"],
+})
+
+
+def read_policy_counts(path, sheet_name):
+    sheet = pd.read_excel(path, sheet_name=sheet_name).fillna("")
+    return {
+        (row["Whitelisted Item Type"], row["Item"]): (row["Number of Emails Sent"], row["Number of Emails Received"])
+        for _, row in sheet.iterrows()
+    }
+
+
+def test_global_and_local_recipient_counts(tmp_path):
+    # Expected values are what the per-row literal_eval implementation produced for these logs
+    (tmp_path / "policies.txt").write_text(POLICIES)
+    EMAIL_LOGS.to_csv(tmp_path / "email_logs.csv", index=False)
+
+    extract_dlp_policies(str(tmp_path), str(tmp_path), str(tmp_path / "email_logs.csv"))
+    output = tmp_path / "policies_DLP_Policies.xlsx"
+
+    assert read_policy_counts(output, "Global Policy") == {
+        ("Whitelisted Sender", "a@corp.com"): (2, ""),
+        ("Whitelisted Recipient Email", "y@ext.com"): ("", 2),
+        ("Whitelisted Recipient Domain", "ext.com"): ("", 3),
+    }
+    assert read_policy_counts(output, "Local Policy") == {
+        ("Whitelisted Sender", "a@corp.com"): (2, ""),
+        ("Whitelisted Sender", "b@corp.com"): (1, ""),
+        ("Whitelisted Recipient Email", "z@other.com"): ("", 1),
+        ("Whitelisted Recipient Domain", "ext.com"): ("", 2),
+    }